@@ -1,3 +1,5 @@
+import os
+
 from django.apps import AppConfig
 
 
@@ -7,10 +9,10 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         # This method is called when the app is ready.
-        # We import and call our model loader here.
-        # --- DISABLED PRE-LOADING ---
-        # The Phi-4 model is too large to pre-load on most consumer GPUs.
-        # It will now be lazy-loaded on the first API request instead.
-        # from . import services
-        # services.summarize_text("Pre-loading summarizer...")
-        pass
+        # The summarization model is lazy-loaded on the first request, so management
+        # commands (migrate, clear_articles, ...) never load it. Set DJANGO_WARMUP_MODEL=1
+        # to load it at startup instead, e.g. for a web server that should be warm
+        # before it takes traffic.
+        if os.environ.get('DJANGO_WARMUP_MODEL') == '1':
+            from . import services
+            services._get_summarizer()
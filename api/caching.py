@@ -0,0 +1,32 @@
+import hashlib
+import os
+from urllib.request import getproxies
+
+# How long scraped article text and generated summaries are used without refreshing (in seconds).
+SCRAPE_CACHE_TIMEOUT = 24 * 3600
+SUMMARY_CACHE_TIMEOUT = 24 * 3600
+# Scraped entries are kept longer than they are fresh, so a stale page can be
+# revalidated with its ETag / Last-Modified instead of being downloaded again.
+SCRAPE_VALIDATOR_TIMEOUT = 7 * 24 * 3600
+# Failed scrapes are remembered briefly, so a site that is down or blocking us
+# doesn't cost a full request timeout on every poll.
+SCRAPE_FAILURE_CACHE_TIMEOUT = 10 * 60
+# NewsAPI results are reused for a few minutes, so most news requests don't wait on NewsAPI at all.
+NEWSAPI_CACHE_TIMEOUT = 5 * 60
+
+def make_cache_key(prefix, value):
+    """
+    Builds a short, fixed-length cache key from an arbitrary string (a URL or article text).
+    blake2b is used because it is fast and the key only needs to be unique, not secret.
+    """
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{prefix}:{digest}"
+
+def should_trust_env():
+    """
+    Returns whether the shared requests sessions should read settings from the environment.
+    With trust_env on, requests re-reads proxy variables and ~/.netrc on every call, which
+    costs more than the rest of its client-side work for a small request. It is only kept
+    when the environment configures a proxy or a CA bundle for requests to pick up.
+    """
+    return bool(getproxies()) or any(os.getenv(name) for name in ('REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE'))
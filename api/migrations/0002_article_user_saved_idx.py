@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['user', '-saved_at'], name='article_user_saved_idx'),
+        ),
+    ]
@@ -12,4 +12,8 @@ class Article(models.Model):
 
     class Meta:
         # Ensures a user cannot save the same article URL twice
-        unique_together = ('user', 'url',)
\ No newline at end of file
+        unique_together = ('user', 'url',)
+        # Serves the saved-articles list (filter by user, newest first) from the index
+        indexes = [
+            models.Index(fields=['user', '-saved_at'], name='article_user_saved_idx'),
+        ]
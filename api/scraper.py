@@ -1,84 +1,602 @@
+import asyncio
+import atexit
+import os
+import threading
+import time
+import aiohttp
 import requests
-from bs4 import BeautifulSoup, NavigableString
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from urllib.parse import urlparse
+from django.conf import settings
+from django.core.cache import cache
+
+from .caching import (
+    make_cache_key,
+    should_trust_env,
+    SCRAPE_CACHE_TIMEOUT,
+    SCRAPE_FAILURE_CACHE_TIMEOUT,
+    SCRAPE_VALIDATOR_TIMEOUT,
+)
+
+try:
+    from pybloomfilter import BloomFilter
+except ImportError:  # Optional: without it, every URL is looked up in the cache
+    BloomFilter = None
 
 # Get a logger instance for this module
 logger = logging.getLogger(__name__)
 
-def scrape_article_text(url):
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Shared session so repeated scrapes reuse pooled connections instead of
+# opening a new TCP/TLS connection for every article.
+_session = requests.Session()
+_session.headers.update(HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False),
+)
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+_session.trust_env = should_trust_env()
+
+# Bloom filter of every URL that has been scraped. A URL that is
+# definitely not in the filter is not looked up in the cache, which saves a round trip
+# to a shared cache (Redis) for the many new URLs in each batch. The filter lives on this
+# host, so a URL another host scraped is scraped again once here; that costs a download,
+# not a wrong result. The filter is memory-mapped from SCRAPER_BLOOM_PATH, so it survives
+# restarts. Sized for ~1 million URLs at a 1% false-positive rate (~1.2 MB per file).
+BLOOM_CAPACITY = 1_000_000
+BLOOM_ERROR_RATE = 0.01
+# A new file is started every SCRAPE_VALIDATOR_TIMEOUT, when the pages the old one covers
+# have dropped out of the cache, so the filter never fills up and old files are removed.
+BLOOM_ROTATION_SECONDS = SCRAPE_VALIDATOR_TIMEOUT
+_seen_urls = None
+_seen_urls_path = None
+_seen_urls_lock = threading.Lock()
+
+# At most this many pages are downloaded at once per batch, and each download gives up
+# after SCRAPE_BATCH_TIMEOUT seconds so one slow site can't hold up the whole response.
+MAX_CONCURRENT_SCRAPES = 10
+SCRAPE_BATCH_TIMEOUT = 8
+
+# Bounded pool for HTML parsing, shared by all requests and event loops, instead of
+# each loop creating (and tearing down) its own default executor.
+_parse_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='scraper-parse')
+
+# scrape_article_texts runs its batches on one background event loop with one long-lived
+# aiohttp session, so keep-alive connections, TLS sessions and DNS lookups are reused
+# across requests instead of being thrown away with a per-batch session.
+_scrape_loop = None
+_scrape_loop_pid = None
+_scrape_thread = None
+_scrape_loop_lock = threading.Lock()
+_http_session = None
+
+# Stop downloading a page after this many (decompressed) bytes. The article body is
+# usually a small part of a page, and huge pages are mostly inlined scripts and styles.
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Common article containers, tried in order. Compiled once at import time
+# so each scrape reuses the same matchers.
+ARTICLE_SELECTORS = [
+    etree.XPath(selector)
+    for selector in (
+        '//article',
+        '//main',
+        '//div[@role="article"]',
+        '//div[contains(concat(" ", normalize-space(@class), " "), " article-body ")]',
+        '//div[contains(concat(" ", normalize-space(@class), " "), " story-content ")]',
+        '//div[@id="main-content"]',
+        '//div[@id="content"]',
+        '//div[contains(concat(" ", normalize-space(@class), " "), " post-content ")]',
+        '//div[contains(concat(" ", normalize-space(@class), " "), " entry-content ")]',
+    )
+]
+
+# Article paragraphs on frequently scraped news sites, keyed by domain (without "www.").
+# A known site's selector is tried before the generic heuristics below, which are still
+# used if it finds too little text (e.g. after a site redesign).
+SITE_SELECTORS = {
+    domain: etree.XPath(selector)
+    for domain, selector in {
+        'bbc.com': '//article//div[@data-component="text-block"]//p',
+        'bbc.co.uk': '//article//div[@data-component="text-block"]//p',
+        'reuters.com': '//div[starts-with(@data-testid, "paragraph-")]',
+        'cnn.com': '//div[contains(@class, "article__content")]//p',
+        'apnews.com': '//div[contains(@class, "RichTextStoryBody")]//p',
+        'theguardian.com': '//div[@id="maincontent"]//p',
+        'nytimes.com': '//section[@name="articleBody"]//p',
+    }.items()
+}
+
+@lru_cache(maxsize=1024)
+def _site_selector_for_host(host):
     """
-    Scrapes the main article text from a given URL using requests and BeautifulSoup.
-    This version does not render JavaScript but is more stable and uses multiple heuristics.
+    Returns the SITE_SELECTORS entry for a host or any of its parent domains
+    (so edition.cnn.com uses the cnn.com selector), or None.
+    """
+    labels = host.lower().removeprefix('www.').split('.')
+    for i in range(len(labels) - 1):
+        selector = SITE_SELECTORS.get('.'.join(labels[i:]))
+        if selector is not None:
+            return selector
+    return None
+
+# lxml parsers must not be shared between threads, so each parse thread gets its own.
+# The parser skips building the id table and drops comments, processing instructions
+# and whitespace-only text nodes, which makes parsing faster and the tree smaller.
+_parser_local = threading.local()
+
+def _get_html_parser():
+    """
+    Returns this thread's HTML parser, creating it on first use.
+    """
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(
+            remove_comments=True,
+            remove_pis=True,
+            remove_blank_text=True,
+            collect_ids=False,
+        )
+        _parser_local.parser = parser
+    return parser
+
+def _element_text(element):
+    """
+    Returns the visible text of an lxml element, with each text node stripped
+    and joined by single spaces.
+    """
+    # Strip each text node once, lazily, and drop the ones that were only whitespace.
+    return ' '.join(filter(None, map(str.strip, element.itertext())))
+
+def _parse(content, url):
+    """
+    Extracts the main article text from raw HTML using multiple heuristics.
 
     Args:
-        url (str): The URL of the news article to scrape.
+        content (bytes): The raw HTML of the page.
+        url (str): The URL the HTML was fetched from (used for logging).
 
     Returns:
-        str: The extracted article text, or None if scraping fails.
+        str: The extracted article text, or None if no sufficient content was found.
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+        tree = lxml.html.fromstring(content, parser=_get_html_parser())
+        # Scripts and styles are never part of the article text.
+        etree.strip_elements(tree, 'script', 'style', 'noscript', with_tail=False)
 
-        soup = BeautifulSoup(response.content, 'lxml')
+        # --- Known sites: use the site's own article selector ---
+        site_selector = _site_selector_for_host(urlparse(url).hostname or '')
+        if site_selector is not None:
+            text = ' '.join(filter(None, map(_element_text, site_selector(tree))))
+            if len(text) > 250:
+                logger.info(f"Successfully scraped content from {url} using site selector: '{site_selector.path}'.")
+                return text
 
         # --- Heuristic 1: Try a list of common, specific selectors first ---
-        selectors = [
-            'article',
-            'main',
-            'div[role="article"]',
-            'div.article-body',
-            'div.story-content',
-            'div#main-content',
-            'div#content',
-            'div.post-content',
-            'div.entry-content',
-        ]
-        for selector in selectors:
-            element = soup.select_one(selector)
-            if element:
-                text = element.get_text(separator=' ', strip=True)
+        for selector in ARTICLE_SELECTORS:
+            elements = selector(tree)
+            if elements:
+                text = _element_text(elements[0])
                 if len(text) > 250:  # Increased threshold for better quality
-                    logger.info(f"Successfully scraped content from {url} using selector: '{selector}'.")
+                    logger.info(f"Successfully scraped content from {url} using selector: '{selector.path}'.")
                     return text
 
         # --- Heuristic 2: Paragraph-based density search (advanced fallback) ---
         # If specific containers fail, find the parent element with the most paragraph text.
-        all_paragraphs = soup.find_all('p')
-        if not all_paragraphs:
+        # Each paragraph's length is added to its parent's score, so every paragraph
+        # is read once instead of re-reading the parent's whole text for each one.
+        scores = defaultdict(int)
+        for p in tree.iter('p'):
+            parent = p.getparent()
+            if parent is not None:
+                scores[parent] += len(p.text_content())
+
+        if not scores:
             logger.warning(f"No <p> tags found on {url}. Cannot use density search.")
             return None
 
-        top_parent = None
-        max_text_len = 0
-
-        for p in all_paragraphs:
-            parent = p.parent
-            if parent:
-                text_len = len(parent.get_text(separator=' ', strip=True))
-                if text_len > max_text_len:
-                    max_text_len = text_len
-                    top_parent = parent
-        
-        if top_parent:
-            # Clean up the extracted text by removing common noise (nav, footer, etc.)
-            for tag in top_parent.find_all(['nav', 'footer', 'aside', 'header', 'script', 'style']):
-                tag.decompose()
-            
-            text = top_parent.get_text(separator=' ', strip=True)
-            if len(text) > 250:
-                logger.info(f"Successfully scraped content from {url} using paragraph density search.")
-                return text
+        top_parent = max(scores, key=scores.get)
+
+        # Clean up the extracted text by removing common noise (nav, footer, etc.)
+        etree.strip_elements(top_parent, 'nav', 'footer', 'aside', 'header', with_tail=False)
+
+        text = _element_text(top_parent)
+        if len(text) > 250:
+            logger.info(f"Successfully scraped content from {url} using paragraph density search.")
+            return text
 
         logger.warning(f"Could not find sufficient content on {url} using any heuristic.")
         return None
 
+    except Exception as e:
+        logger.error(f"An error occurred while scraping {url}: {e}")
+        return None
+
+def _read_capped(chunks, url):
+    """
+    Joins downloaded chunks into a single body, stopping at MAX_CONTENT_BYTES.
+
+    Args:
+        chunks (iterable[bytes]): The decompressed response body, in chunks.
+        url (str): The URL being downloaded (used for logging).
+
+    Returns:
+        bytes: At most MAX_CONTENT_BYTES of the body.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer.extend(chunk)
+        if len(buffer) >= MAX_CONTENT_BYTES:
+            logger.info(f"Page {url} is larger than {MAX_CONTENT_BYTES} bytes. Only the start will be parsed.")
+            break
+    return bytes(buffer[:MAX_CONTENT_BYTES])
+
+def _get_seen_urls():
+    """
+    Returns the Bloom filter of scraped URLs, opening or creating the current file on first
+    use and after each rotation. Returns None if the filter is disabled or unavailable.
+    """
+    global _seen_urls, _seen_urls_path
+
+    path = getattr(settings, 'SCRAPER_BLOOM_PATH', None)
+    if BloomFilter is None or not path:
+        return None
+
+    current = _bloom_generation_path(path)
+    if _seen_urls_path != current:
+        with _seen_urls_lock:
+            if _seen_urls_path != current:
+                try:
+                    _seen_urls = _open_bloom_filter(current)
+                except Exception as e:
+                    logger.error(f"Could not open URL Bloom filter at {current}: {e}")
+                    return None
+                _seen_urls_path = current
+                _remove_old_bloom_filters(path, current)
+
+    return _seen_urls
+
+def _bloom_generation_path(path):
+    """
+    Returns the file of the current filter generation, e.g. articles.2891.bloom.
+    Every process computes the same name, so they rotate together without a lock.
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}.{int(time.time() // BLOOM_ROTATION_SECONDS)}{ext}"
+
+def _remove_old_bloom_filters(path, current):
+    """
+    Deletes the files of earlier filter generations. A process that still has one open
+    keeps its mapping until it rotates too.
+    """
+    root, ext = os.path.splitext(path)
+    directory, prefix = os.path.split(root)
+    for name in os.listdir(directory or '.'):
+        old_path = os.path.join(directory, name)
+        if name.startswith(f"{prefix}.") and name.endswith(ext) and old_path != current and '.tmp-' not in name:
+            try:
+                os.unlink(old_path)
+            except OSError:
+                pass  # Another process removed it first.
+
+def _open_bloom_filter(path):
+    """
+    Opens the Bloom filter file at path, creating it if it doesn't exist.
+    A new filter is built in a temporary file and hard-linked into place, which fails if
+    another process created the file first; every process then opens the same file.
+    """
+    if not os.path.exists(path):
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            BloomFilter(BLOOM_CAPACITY, BLOOM_ERROR_RATE, tmp_path).close()
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass  # Another process created it first; use theirs.
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    return BloomFilter.open(path)
+
+def _make_entry(text, etag, last_modified):
+    """
+    Builds the cache entry for a scraped URL: the extracted text plus the
+    validators needed to revalidate it later with a conditional GET.
+    """
+    return {
+        'text': text,
+        'etag': etag,
+        'last_modified': last_modified,
+        'fetched_at': time.time(),
+    }
+
+def _is_fresh(entry):
+    """
+    Returns True if a cache entry is recent enough to be used without asking the site.
+    Entries for failed scrapes (text is None) go stale much sooner than successful ones.
+    """
+    if entry is None:
+        return False
+    max_age = SCRAPE_CACHE_TIMEOUT if entry['text'] else SCRAPE_FAILURE_CACHE_TIMEOUT
+    return time.time() - entry['fetched_at'] < max_age
+
+def _entry_after_failure(previous):
+    """
+    Returns the cache entry to store after a failed scrape.
+    If the previous entry had text, it is kept (with its ETag / Last-Modified) and marked
+    so the site is asked again after SCRAPE_FAILURE_CACHE_TIMEOUT. Otherwise the failure
+    itself is remembered.
+    """
+    if previous and previous['text']:
+        entry = dict(previous)
+        entry['fetched_at'] = time.time() - SCRAPE_CACHE_TIMEOUT + SCRAPE_FAILURE_CACHE_TIMEOUT
+        return entry
+    return _make_entry(None, None, None)
+
+def _conditional_headers(entry):
+    """
+    Returns the If-None-Match / If-Modified-Since headers for revalidating a cache entry.
+    """
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+def _revalidated(entry, url):
+    """
+    Returns a copy of a cache entry whose page the site reported as unchanged (304).
+    """
+    logger.info(f"{url} has not changed since it was last scraped. Reusing cached text.")
+    return {**entry, 'fetched_at': time.time()}
+
+def scrape_article_text(url):
+    """
+    Scrapes the main article text from a given URL using requests and lxml.
+    This version does not render JavaScript but is more stable and uses multiple heuristics.
+    Results are cached by URL, so repeat requests skip the download entirely
+    (failures are only remembered for a few minutes).
+    Once a cached result goes stale it is revalidated with a conditional GET, so an
+    unchanged page costs a 304 response instead of a full download and parse.
+
+    Args:
+        url (str): The URL of the news article to scrape.
+
+    Returns:
+        str: The extracted article text, or None if scraping fails.
+    """
+    if not url:
+        return None
+
+    key = make_cache_key('scrape', url)
+    seen_urls = _get_seen_urls()
+    entry = None
+    if seen_urls is None or url in seen_urls:
+        entry = cache.get(key)
+        if _is_fresh(entry):
+            return entry['text']
+
+    scraped = _scrape_article_text(url, entry)
+    if scraped is None:
+        # A failed revalidation keeps the last good text instead of throwing it away.
+        entry = _entry_after_failure(entry)
+        cache.set(key, entry, SCRAPE_VALIDATOR_TIMEOUT if entry['text'] else SCRAPE_FAILURE_CACHE_TIMEOUT)
+    else:
+        entry = scraped
+        cache.set(key, entry, SCRAPE_VALIDATOR_TIMEOUT)
+    if seen_urls is not None:
+        seen_urls.add(url)
+    return entry['text']
+
+def _scrape_article_text(url, previous=None):
+    """
+    Downloads and parses a single URL, without using the cache.
+    If a previous cache entry is given, the request is made conditional on it.
+
+    Returns:
+        dict: A new cache entry (see _make_entry), or None if scraping fails.
+    """
+    try:
+        with _session.get(url, headers=_conditional_headers(previous), stream=True, timeout=15) as response:
+            if response.status_code == 304 and previous:
+                return _revalidated(previous, url)
+            response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+            content = _read_capped(response.iter_content(chunk_size=CHUNK_SIZE), url)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
     except requests.exceptions.RequestException as e:
         logger.error(f"Request failed for {url}: {e}")
         return None
     except Exception as e:
         logger.error(f"An error occurred while scraping {url}: {e}")
         return None
+
+    text = _parse(content, url)
+    return _make_entry(text, etag, last_modified) if text else None
+
+async def _fetch_and_parse(session, url, previous=None):
+    """
+    Downloads a single URL with the shared session and parses it off the event loop.
+    If a previous cache entry is given, the request is made conditional on it.
+
+    Returns:
+        dict: A new cache entry (see _make_entry), or None if scraping fails.
+    """
+    if not url:
+        return None
+
+    try:
+        async with session.get(url, headers=_conditional_headers(previous)) as response:
+            if response.status == 304 and previous:
+                return _revalidated(previous, url)
+            response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+            chunks = []
+            size = 0
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= MAX_CONTENT_BYTES:
+                    break
+            content = _read_capped(chunks, url)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Request failed for {url}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"An error occurred while scraping {url}: {e}")
+        return None
+
+    # Parsing is CPU-bound, so run it in a worker thread while other downloads continue.
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(_parse_executor, _parse, content, url)
+    return _make_entry(text, etag, last_modified) if text else None
+
+def _new_http_session():
+    """
+    Creates the aiohttp session used for scraping. Must be called on the background loop.
+    """
+    connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=SCRAPE_BATCH_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, headers=HEADERS, timeout=timeout)
+
+def _get_scrape_loop():
+    """
+    Returns the background event loop used by scrape_article_texts, starting it on first use.
+    A forked process (e.g. a Celery worker) starts its own loop, since threads don't survive
+    a fork, and a new loop is started if the loop thread has died.
+    """
+    global _scrape_loop, _scrape_loop_pid, _scrape_thread, _http_session
+    with _scrape_loop_lock:
+        if _scrape_loop is None or _scrape_loop_pid != os.getpid() or not _scrape_thread.is_alive():
+            _scrape_loop = asyncio.new_event_loop()
+            _scrape_loop_pid = os.getpid()
+            _http_session = None
+            _scrape_thread = threading.Thread(target=_scrape_loop.run_forever, name='scraper-loop', daemon=True)
+            _scrape_thread.start()
+    return _scrape_loop
+
+@atexit.register
+def _close_http_session():
+    """
+    Closes the long-lived session when the process exits, so aiohttp doesn't warn about it.
+    """
+    if _http_session is None or _scrape_loop_pid != os.getpid():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_http_session.close(), _scrape_loop).result(timeout=5)
+    except Exception:
+        pass
+
+async def _scrape_entries_async(urls, previous_entries):
+    """
+    Scrapes several URLs concurrently with the long-lived session, returning a cache entry
+    (or None) for each. Only run on the background loop, so the session is created and used
+    by a single thread.
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = _new_http_session()
+    session = _http_session
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+
+    async def bounded_fetch(url, previous):
+        async with semaphore:
+            return await _fetch_and_parse(session, url, previous)
+
+    results = await asyncio.gather(
+        *[bounded_fetch(url, previous) for url, previous in zip(urls, previous_entries)],
+        return_exceptions=True,
+    )
+
+    # A failure on one URL should never fail the whole batch.
+    entries = []
+    for url, result in zip(urls, results):
+        if isinstance(result, BaseException):
+            logger.error(f"An error occurred while scraping {url}: {result}")
+            result = None
+        entries.append(result)
+    return entries
+
+def _scrape_entries(urls, previous_entries):
+    """
+    Runs _scrape_entries_async on the background loop and waits for it.
+    If the batch takes longer than it possibly should (e.g. the loop is stuck), it is
+    cancelled and every URL is treated as failed, so the caller never hangs.
+    """
+    # Downloads run MAX_CONCURRENT_SCRAPES at a time and each gives up after
+    # SCRAPE_BATCH_TIMEOUT seconds; one extra round leaves time for parsing.
+    rounds = -(-len(urls) // MAX_CONCURRENT_SCRAPES)
+    timeout = (rounds + 1) * SCRAPE_BATCH_TIMEOUT
+    future = asyncio.run_coroutine_threadsafe(_scrape_entries_async(urls, previous_entries), _get_scrape_loop())
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        logger.error(f"Scraping {len(urls)} URLs did not finish within {timeout} seconds.")
+        return [None] * len(urls)
+
+def scrape_article_texts(urls):
+    """
+    Synchronous entry point for scraping a batch, for use in regular views and tasks.
+    The downloads run on a shared background event loop with a long-lived session.
+    URLs that were scraped recently are served from the cache instead of being downloaded,
+    and stale ones are revalidated with conditional GETs.
+    """
+    if not urls:
+        return []
+
+    # Serve what we can from the cache in a single round trip. URLs the Bloom filter
+    # has never seen can't be cached, so they aren't looked up at all.
+    seen_urls = _get_seen_urls()
+    keys = [make_cache_key('scrape', url) if url else None for url in urls]
+    lookup_keys = [key for url, key in zip(urls, keys) if key and (seen_urls is None or url in seen_urls)]
+    cached = cache.get_many(lookup_keys) if lookup_keys else {}
+    results = [None] * len(urls)
+    missing = []
+    for i, key in enumerate(keys):
+        if not key:
+            continue
+        entry = cached.get(key)
+        if _is_fresh(entry):
+            results[i] = entry['text']
+        else:
+            missing.append(i)
+
+    # Only missing or stale URLs are requested.
+    if missing:
+        entries = _scrape_entries([urls[i] for i in missing], [cached.get(keys[i]) for i in missing])
+        fresh = {}
+        failed = {}
+        for i, entry in zip(missing, entries):
+            if entry is None:
+                # A failed revalidation keeps the last good text instead of throwing it away.
+                entry = _entry_after_failure(cached.get(keys[i]))
+                (fresh if entry['text'] else failed)[keys[i]] = entry
+            else:
+                fresh[keys[i]] = entry
+            results[i] = entry['text']
+            if seen_urls is not None:
+                seen_urls.add(urls[i])
+        if fresh:
+            cache.set_many(fresh, SCRAPE_VALIDATOR_TIMEOUT)
+        if failed:
+            cache.set_many(failed, SCRAPE_FAILURE_CACHE_TIMEOUT)
+
+    return results
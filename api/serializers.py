@@ -28,4 +28,51 @@ class ArticleSerializer(serializers.ModelSerializer):
         # We exclude the 'user' field because it will be set automatically
         # in the view based on the logged-in user.why
         fields = ('id', 'title', 'url', 'source_name', 'summary', 'published_at', 'saved_at')
-        read_only_fields = ('saved_at',)
\ No newline at end of file
+        read_only_fields = ('saved_at',)
+        # The summary may be left out, blank or null (it was still pending); it is generated on save.
+        extra_kwargs = {'summary': {'required': False, 'allow_blank': True, 'allow_null': True}}
+
+class ArticleBulkListSerializer(serializers.ListSerializer):
+    """
+    Saves a list of articles with a single bulk INSERT instead of one query per article.
+
+    Article URLs are unique across all users, so articles whose URL is already saved
+    (by this user or another one) are not inserted. After save(), `skipped` lists them
+    with the reason, and the returned list holds only the articles actually created.
+    """
+    def create(self, validated_data):
+        # One SELECT finds every URL that is already taken, instead of one per article.
+        urls = [item['url'] for item in validated_data]
+        owners = dict(Article.objects.filter(url__in=urls).values_list('url', 'user_id'))
+
+        articles = []
+        self.skipped = []
+        for item in validated_data:
+            url = item['url']
+            if url in owners:
+                reason = 'already_saved' if owners[url] == item['user'].pk else 'saved_by_another_user'
+                self.skipped.append({'url': url, 'reason': reason})
+                continue
+            owners[url] = item['user'].pk  # Later copies of the same URL in this request are duplicates.
+            articles.append(Article(**item))
+
+        if not articles:
+            return []
+        # ignore_conflicts only covers a concurrent save of the same URL between the SELECT and the INSERT.
+        Article.objects.bulk_create(articles, ignore_conflicts=True, batch_size=500)
+        # bulk_create doesn't return primary keys when conflicts are ignored, so read the rows back.
+        user = validated_data[0]['user']
+        return list(
+            Article.objects.filter(user=user, url__in=[article.url for article in articles])
+            .order_by('-saved_at')
+        )
+
+class ArticleBulkSerializer(ArticleSerializer):
+    """
+    Serializer for saving many articles at once. Use with many=True.
+    """
+    class Meta(ArticleSerializer.Meta):
+        list_serializer_class = ArticleBulkListSerializer
+        # Skip the per-article uniqueness query; conflicts are ignored on insert.
+        # Bulk saves must include summaries, so a large request can't trigger a model run per article.
+        extra_kwargs = {'url': {'validators': []}}
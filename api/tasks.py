@@ -0,0 +1,108 @@
+from celery import shared_task
+from celery.signals import worker_init, worker_process_init
+import logging
+
+from django.core.cache import cache
+
+from . import services
+from .caching import make_cache_key, SUMMARY_CACHE_TIMEOUT, SCRAPE_FAILURE_CACHE_TIMEOUT
+from .models import Article
+from .scraper import scrape_article_texts
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+@worker_init.connect
+def prepare_summarizer(**kwargs):
+    """
+    Runs the slow one-off model setup (the int8 conversion) in the main worker process,
+    before the pool starts, so it doesn't count against the child start-up timeout.
+    """
+    services.prepare_summarizer_model()
+
+@worker_process_init.connect
+def load_summarizer(**kwargs):
+    """
+    Loads the summarization model once when each worker process starts,
+    so the first task does not pay the model loading cost.
+    Must finish within CELERY_WORKER_PROC_ALIVE_TIMEOUT, or Celery kills the child.
+    """
+    logger.info("Worker starting. Pre-loading summarizer...")
+    services._get_summarizer()
+
+def _scrape_and_summarize(items, urls):
+    """
+    Does the work of scrape_and_summarize_task and caches the summaries.
+    """
+    # All pages are downloaded concurrently, so this takes roughly as long as the slowest one.
+    scraped_contents = scrape_article_texts(urls)
+
+    texts = []
+    for (url, fallback_text), scraped_content in zip(items, scraped_contents):
+        text = scraped_content or fallback_text or ""
+        if not text.strip():
+            logger.warning("No content found for summarization for %s.", url)
+        texts.append(text)
+
+    # One batched pipeline call for the whole request.
+    summaries = services.summarize_texts(texts)
+
+    # Only summaries of the scraped page are kept for a day. A summary of the NewsAPI
+    # snippet, or an empty one from a failed model run, is kept only as long as a failed
+    # scrape, so the article is scraped and summarized again soon after.
+    complete, retry = {}, {}
+    for url, scraped_content, summary in zip(urls, scraped_contents, summaries):
+        key = make_cache_key('summ', url)
+        if scraped_content and summary.strip():
+            complete[key] = summary
+        else:
+            retry[key] = summary
+    if complete:
+        cache.set_many(complete, SUMMARY_CACHE_TIMEOUT)
+    if retry:
+        cache.set_many(retry, SCRAPE_FAILURE_CACHE_TIMEOUT)
+    return summaries
+
+@shared_task(bind=True)
+def scrape_and_summarize_task(self, items):
+    """
+    Scrapes and summarizes a batch of articles on a Celery worker, then stores each
+    summary in the cache under make_cache_key('summ', url) for the views and the
+    /api/summary/ endpoint to pick up.
+
+    items is a list of [url, fallback_text] pairs. The fallback (the NewsAPI content
+    or description) is summarized when the page can't be scraped.
+    """
+    logger.info("Task %s: scraping and summarizing %d articles.", self.request.id, len(items))
+    urls = [url for url, _ in items]
+    try:
+        return _scrape_and_summarize(items, urls)
+    except Exception:
+        # Let the next request dispatch these articles again instead of waiting
+        # for the pending markers to expire.
+        cache.delete_many([make_cache_key('summ-pending', url) for url in urls])
+        raise
+
+@shared_task(bind=True, max_retries=3)
+def summarize_saved_article_task(self, article_id):
+    """
+    Fills in the summary of an article that was saved without one.
+
+    The background summary is used if it is ready; otherwise the page is scraped and
+    summarized. If that fails, the summary is left empty and the task retries after
+    SCRAPE_FAILURE_CACHE_TIMEOUT, instead of storing a placeholder for good.
+    """
+    article = Article.objects.filter(pk=article_id).only('url', 'summary').first()
+    if article is None or article.summary.strip():
+        return
+    summary = cache.get(make_cache_key('summ', article.url)) or ""
+    if not summary.strip():
+        summary = _scrape_and_summarize([[article.url, ""]], [article.url])[0]
+    if not summary.strip():
+        if self.request.is_eager:
+            # An eager retry would run again straight away; the next save or summary request retries instead.
+            logger.warning("Could not summarize saved article %s.", article_id)
+            return
+        raise self.retry(countdown=SCRAPE_FAILURE_CACHE_TIMEOUT)
+    # Don't overwrite a summary that was added in the meantime.
+    Article.objects.filter(pk=article_id, summary="").update(summary=summary)
@@ -1,14 +1,29 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.exceptions import ImproperlyConfigured
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
 from unittest.mock import patch, MagicMock, ANY
+from django.core.cache import cache
+import asyncio
 import requests
+import os
+import runpy
+import tempfile
+import threading
+import time
+from news_summary_project import settings as project_settings
 from . import services
 from . import scraper
+from . import tasks
 from .models import Article
+from .caching import make_cache_key, should_trust_env, SUMMARY_CACHE_TIMEOUT, SCRAPE_FAILURE_CACHE_TIMEOUT
 
 # --- MOCK DATA ---
 
+def long_text(label):
+    """An article-length text (long enough to be sent to the model) starting with label."""
+    return label + " and more words" * services.SHORT_TEXT_WORDS
+
 def mock_news_api_success_data():
     """A sample successful response from NewsAPI."""
     return {
@@ -44,14 +59,82 @@ def mock_scraper_success_html():
 
 # --- UNIT TESTS ---
 
+# The URL Bloom filter is a persistent file; tests that need it point it at a temporary one.
+@override_settings(SCRAPER_BLOOM_PATH='')
 class ServiceUnitTests(TestCase):
     """
     Unit tests for individual functions in services.py and scraper.py.
     These tests do not involve live network requests or model loading.
     """
 
+    def setUp(self):
+        """Start every test with an empty cache so cached results don't leak between tests."""
+        cache.clear()
+
+    @patch.dict('os.environ', {'NEWS_API_KEY': 'test-key'})
+    @patch('api.services._NEWSAPI_SESSION.get')
+    def test_fetch_from_news_api_encodes_search_term(self, mock_session_get):
+        """Test that search terms are sent as encoded query parameters over the shared session."""
+        print("\n--- UNIT TEST: Testing fetch_from_news_api (Query Encoding) ---")
+        mock_session_get.return_value.json.return_value = mock_news_api_success_data()
+
+        print("LOG: Searching for 'AI & ML'...")
+        result = services.fetch_from_news_api(search_term="AI & ML")
+
+        self.assertEqual(result, mock_news_api_success_data())
+        mock_session_get.assert_called_once_with(
+            "https://newsapi.org/v2/everything",
+            params={'q': "AI & ML", 'apiKey': 'test-key'},
+            timeout=services.NEWSAPI_TIMEOUT,
+        )
+        print("LOG: Search term was passed as a query parameter, not pasted into the URL.")
+
+    def test_should_trust_env(self):
+        """Test that sessions only read the environment when it configures a proxy or CA bundle."""
+        print("\n--- UNIT TEST: Testing should_trust_env ---")
+        with patch('api.caching.getproxies', return_value={}), patch.dict('os.environ', clear=True):
+            self.assertFalse(should_trust_env())
+        with patch('api.caching.getproxies', return_value={'https': 'http://proxy:3128'}), \
+                patch.dict('os.environ', clear=True):
+            self.assertTrue(should_trust_env())
+        with patch('api.caching.getproxies', return_value={}), \
+                patch.dict('os.environ', {'REQUESTS_CA_BUNDLE': '/etc/ssl/corp.pem'}, clear=True):
+            self.assertTrue(should_trust_env())
+        print("LOG: trust_env is only kept for a proxy or a CA bundle.")
+
+    def test_broker_requires_shared_cache(self):
+        """Test that a Celery broker without a shared cache is rejected at start-up."""
+        print("\n--- UNIT TEST: Testing CELERY_BROKER_URL without REDIS_URL ---")
+        with patch.dict('os.environ', {'CELERY_BROKER_URL': 'redis://localhost:6379/0', 'REDIS_URL': ''}):
+            with self.assertRaises(ImproperlyConfigured):
+                runpy.run_path(project_settings.__file__)
+        with patch.dict('os.environ', {'CELERY_BROKER_URL': 'redis://localhost:6379/0',
+                                       'REDIS_URL': 'redis://localhost:6379/1'}):
+            loaded = runpy.run_path(project_settings.__file__)
+        self.assertEqual(loaded['CACHES']['default']['BACKEND'], 'django.core.cache.backends.redis.RedisCache')
+        print("LOG: A broker is only accepted together with REDIS_URL.")
+
+    @patch.dict('os.environ', {'NEWS_API_KEY': 'test-key'})
+    @patch('api.services._NEWSAPI_SESSION.get')
+    def test_fetch_from_news_api_uses_cache(self, mock_session_get):
+        """Test that NewsAPI results are reused, but failed requests are not cached."""
+        print("\n--- UNIT TEST: Testing fetch_from_news_api (Cache) ---")
+        mock_session_get.side_effect = requests.exceptions.ConnectionError("NewsAPI is down")
+
+        print("LOG: Fetching while NewsAPI is down, then twice after it recovers...")
+        self.assertIn('error', services.fetch_from_news_api())
+        mock_session_get.side_effect = None
+        mock_session_get.return_value.json.return_value = mock_news_api_success_data()
+        services.fetch_from_news_api()
+        result = services.fetch_from_news_api()
+
+        self.assertEqual(result, mock_news_api_success_data())
+        self.assertEqual(mock_session_get.call_count, 2)
+        print("LOG: The error was not cached and the successful response was reused.")
+
+    @patch('api.services.torch.cuda.is_available', return_value=False)
     @patch('api.services.pipeline')
-    def test_summarize_text_success(self, mock_pipeline):
+    def test_summarize_text_success(self, mock_pipeline, mock_cuda_available):
         """Test that summarize_text returns a valid summary without loading the real model."""
         print("\n--- UNIT TEST: Testing summarize_text (Success) ---")
         # This mock simulates the summarizer object that the pipeline function would return
@@ -63,7 +146,7 @@ class ServiceUnitTests(TestCase):
         services.summarizer_pipeline = None
         
         print("LOG: Calling summarize_text with mock pipeline...")
-        summary = services.summarize_text("This is a long piece of text to summarize.")
+        summary = services.summarize_text(long_text("This is a long piece of text to summarize."))
         
         self.assertEqual(summary, "This is a mock summary.")
         print("LOG: Successfully received mock summary.")
@@ -73,7 +156,117 @@ class ServiceUnitTests(TestCase):
         mock_pipeline.assert_called_once_with("summarization", model='sshleifer/distilbart-cnn-12-6')
         
         # Assert that the summarizer instance itself was called with the correct text
-        mock_summarizer_instance.assert_called_once_with("This is a long piece of text to summarize.", truncation=True)
+        mock_summarizer_instance.assert_called_once_with(
+            long_text("This is a long piece of text to summarize."), truncation=True, **services.GENERATION_KWARGS
+        )
+
+    @patch('api.services.AutoTokenizer')
+    @patch('api.services.ctranslate2')
+    def test_ctranslate2_summarizer(self, mock_ctranslate2, mock_auto_tokenizer):
+        """Test that the CTranslate2 backend returns pipeline-style results."""
+        print("\n--- UNIT TEST: Testing CTranslate2Summarizer ---")
+        mock_ctranslate2.get_cuda_device_count.return_value = 0
+        mock_translator = mock_ctranslate2.Translator.return_value
+        mock_translator.translate_batch.return_value = [MagicMock(hypotheses=[['a', 'b']])]
+        mock_tokenizer = mock_auto_tokenizer.from_pretrained.return_value
+        mock_tokenizer.decode.return_value = "A quantized summary."
+
+        print("LOG: Calling CTranslate2Summarizer with mocked translator...")
+        summarizer = services.CTranslate2Summarizer("distilbart-cnn-12-6-int8")
+        result = summarizer("Some article text.", truncation=True)
+
+        self.assertEqual(result, [{'summary_text': "A quantized summary."}])
+        mock_ctranslate2.Translator.assert_called_once_with(
+            "distilbart-cnn-12-6-int8",
+            device="cpu",
+            compute_type="int8",
+            inter_threads=services.SUMMARIZER_WORKERS,
+            intra_threads=ANY,
+        )
+        print("LOG: Received pipeline-style summary from the int8 model on CPU.")
+
+    @patch('api.services.CTranslate2Summarizer')
+    @patch('api.services.ctranslate2')
+    def test_ctranslate2_model_is_converted_on_first_load(self, mock_ctranslate2, mock_ct2_summarizer):
+        """Test that a missing CTranslate2 model directory is created by converting the model."""
+        print("\n--- UNIT TEST: Testing CTranslate2 conversion on first load ---")
+        model_dir = os.path.join(tempfile.mkdtemp(), "distilbart-int8")
+
+        def fake_convert(output_dir, **kwargs):
+            os.makedirs(output_dir)
+            return output_dir
+
+        mock_converter = mock_ctranslate2.converters.TransformersConverter.return_value
+        mock_converter.convert.side_effect = fake_convert
+
+        print("LOG: Loading the summarizer with an empty SUMMARIZER_CT2_MODEL_DIR...")
+        with patch('api.services.SUMMARIZER_CT2_MODEL_DIR', model_dir):
+            services._load_summarizer()
+
+        mock_ctranslate2.converters.TransformersConverter.assert_called_once_with('sshleifer/distilbart-cnn-12-6')
+        mock_converter.convert.assert_called_once_with(ANY, quantization="int8", force=True)
+        self.assertTrue(os.path.isdir(model_dir))
+        mock_ct2_summarizer.assert_called_once_with(model_dir)
+        print("LOG: The model was converted to int8 and loaded from the configured directory.")
+
+    @patch('api.services.pipeline')
+    def test_summarize_texts_uses_cache(self, mock_pipeline):
+        """Test that texts summarized before are served from the cache instead of the model."""
+        print("\n--- UNIT TEST: Testing summarize_texts (Cache) ---")
+        mock_summarizer_instance = MagicMock(side_effect=[
+            [{'summary_text': 'Cached summary.'}],
+            [{'summary_text': 'New summary.'}],
+        ])
+        mock_pipeline.return_value = mock_summarizer_instance
+        services.summarizer_pipeline = None
+
+        print("LOG: Summarizing a text, then the same text together with a new one...")
+        services.summarize_texts([long_text("Repeated text.")])
+        summaries = services.summarize_texts([long_text("Repeated text."), long_text("Fresh text.")])
+
+        self.assertEqual(summaries, ["Cached summary.", "New summary."])
+        # The second call should only send the uncached text to the model.
+        mock_summarizer_instance.assert_called_with(
+            [long_text("Fresh text.")], truncation=True, batch_size=8, **services.GENERATION_KWARGS
+        )
+        print("LOG: Repeated text was served from the cache.")
+
+    @patch('api.services.pipeline')
+    def test_summarize_text_truncates_long_input(self, mock_pipeline):
+        """Test that very long texts are cut to MAX_INPUT_CHARS before reaching the model."""
+        print("\n--- UNIT TEST: Testing summarize_text (Long Input) ---")
+        mock_summarizer_instance = MagicMock(return_value=[{'summary_text': 'Short summary.'}])
+        mock_pipeline.return_value = mock_summarizer_instance
+        services.summarizer_pipeline = None
+
+        long_text = "word " * services.MAX_INPUT_CHARS
+        services.summarize_text(long_text)
+
+        sent_text = mock_summarizer_instance.call_args.args[0]
+        self.assertEqual(len(sent_text), services.MAX_INPUT_CHARS)
+        print("LOG: Only the first MAX_INPUT_CHARS characters were sent to the model.")
+
+    @patch('api.services.pipeline')
+    def test_summarizer_loads_once_under_concurrency(self, mock_pipeline):
+        """Test that concurrent first requests only load the model once."""
+        print("\n--- UNIT TEST: Testing summarizer loading (Concurrent) ---")
+
+        def slow_pipeline(*args, **kwargs):
+            time.sleep(0.1)
+            return MagicMock()
+
+        mock_pipeline.side_effect = slow_pipeline
+        services.summarizer_pipeline = None
+
+        threads = [threading.Thread(target=services._get_summarizer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_pipeline.assert_called_once()
+        print("LOG: The model was loaded exactly once.")
+        services.summarizer_pipeline = None
 
     def test_summarize_text_empty_input(self):
         """Test that summarize_text handles empty or whitespace input gracefully."""
@@ -88,13 +281,103 @@ class ServiceUnitTests(TestCase):
         self.assertEqual(result_whitespace, "Content was empty or could not be scraped. No summary available.")
         print("LOG: Correctly handled whitespace string.")
 
-    @patch('api.scraper.requests.get')
+    @patch('api.services.pipeline')
+    def test_summarize_text_short_input(self, mock_pipeline):
+        """Test that texts shorter than SHORT_TEXT_WORDS are returned without running the model."""
+        print("\n--- UNIT TEST: Testing summarize_text (Short Input) ---")
+        services.summarizer_pipeline = None
+
+        print("LOG: Summarizing a one-sentence description...")
+        result = services.summarize_text("  Markets rallied after the central bank held rates steady.  ")
+
+        self.assertEqual(result, "Markets rallied after the central bank held rates steady.")
+        mock_pipeline.assert_not_called()
+        print("LOG: The short text was returned as is and the model was never loaded.")
+
+    @patch('api.services.torch.cuda.is_available', return_value=True)
+    @patch('api.services.pipeline')
+    def test_summarizer_uses_half_precision_on_gpu(self, mock_pipeline, mock_cuda_available):
+        """Test that the pipeline is loaded on the GPU in float16 when CUDA is available."""
+        print("\n--- UNIT TEST: Testing summarizer loading (GPU) ---")
+        services.summarizer_pipeline = None
+
+        services._get_summarizer()
+
+        mock_pipeline.assert_called_once_with(
+            "summarization",
+            model='sshleifer/distilbart-cnn-12-6',
+            device=0,
+            dtype=services.torch.float16,
+        )
+        print("LOG: Pipeline was created on device 0 with float16 weights.")
+        services.summarizer_pipeline = None
+
+    @patch('api.tasks.cache')
+    @patch('api.tasks.services.summarize_texts')
+    @patch('api.tasks.scrape_article_texts')
+    def test_task_caches_fallback_summaries_briefly(self, mock_scrape, mock_summarize, mock_cache):
+        """Test that summaries of the NewsAPI snippet are cached only until the scrape is retried."""
+        print("\n--- UNIT TEST: Testing scrape_and_summarize_task (Scrape Failure) ---")
+        mock_scrape.return_value = [long_text("Scraped"), None]
+        mock_summarize.return_value = ["Full summary.", "Snippet summary."]
+
+        tasks.scrape_and_summarize_task([['http://example.com/ok', ''], ['http://example.com/down', 'Snippet.']])
+        mock_cache.set_many.assert_any_call(
+            {make_cache_key('summ', 'http://example.com/ok'): "Full summary."}, SUMMARY_CACHE_TIMEOUT)
+        mock_cache.set_many.assert_any_call(
+            {make_cache_key('summ', 'http://example.com/down'): "Snippet summary."}, SCRAPE_FAILURE_CACHE_TIMEOUT)
+        print("LOG: The scraped summary is kept for a day, the snippet summary for the failure timeout.")
+
+    @patch('api.tasks.cache')
+    @patch('api.tasks.services.summarize_texts')
+    @patch('api.tasks.scrape_article_texts')
+    def test_task_caches_failed_summaries_briefly(self, mock_scrape, mock_summarize, mock_cache):
+        """Test that an empty summary from a failed model run is not cached for a day."""
+        print("\n--- UNIT TEST: Testing scrape_and_summarize_task (Model Failure) ---")
+        mock_scrape.return_value = [long_text("Scraped")]
+        mock_summarize.return_value = [""]
+
+        tasks.scrape_and_summarize_task([['http://example.com/oom', '']])
+        mock_cache.set_many.assert_called_once_with(
+            {make_cache_key('summ', 'http://example.com/oom'): ""}, SCRAPE_FAILURE_CACHE_TIMEOUT)
+        print("LOG: The failed summary expires with the failure timeout and is retried.")
+
+    @patch('api.services.pipeline')
+    def test_summarize_texts_batch(self, mock_pipeline):
+        """Test that summarize_texts makes one batched call and keeps results aligned with the input."""
+        print("\n--- UNIT TEST: Testing summarize_texts (Batch) ---")
+        # Texts are sent longest first, so the model sees "Second text!!" before "First text."
+        mock_summarizer_instance = MagicMock(return_value=[
+            {'summary_text': 'Second summary.'},
+            {'summary_text': 'First summary.'},
+        ])
+        mock_pipeline.return_value = mock_summarizer_instance
+        services.summarizer_pipeline = None
+
+        print("LOG: Calling summarize_texts with a mix of real, empty and duplicate texts...")
+        summaries = services.summarize_texts(
+            [long_text("First text."), "", long_text("Second text!!"), "   ", long_text("First text."), " A short description. "]
+        )
+
+        self.assertEqual(
+            summaries, ["First summary.", "", "Second summary.", "", "First summary.", "A short description."]
+        )
+        print("LOG: Summaries were returned in the original order with empty sentinels.")
+
+        # Only the unique non-empty, non-short texts should be sent to the model, in a single call.
+        mock_summarizer_instance.assert_called_once_with(
+            [long_text("Second text!!"), long_text("First text.")], truncation=True, batch_size=8, **services.GENERATION_KWARGS
+        )
+
+    @patch('api.scraper._session.get')
     def test_scrape_article_text_success(self, mock_requests_get):
         """Test successful scraping of an HTML page."""
         print("\n--- UNIT TEST: Testing scrape_article_text (Success) ---")
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.content = mock_scraper_success_html().encode('utf-8')
+        mock_response.iter_content.return_value = [mock_scraper_success_html().encode('utf-8')]
+        mock_response.headers = {}
+        mock_response.__enter__.return_value = mock_response
         mock_requests_get.return_value = mock_response
 
         print("LOG: Calling scrape_article_text with mock HTML...")
@@ -106,25 +389,228 @@ class ServiceUnitTests(TestCase):
             self.assertIn("This is the first paragraph", content)
             print("LOG: Successfully scraped and found content.")
 
-    @patch('api.scraper.requests.get')
-    def test_scrape_article_text_http_error(self, mock_requests_get):
+    @patch('api.scraper._session.get')
+    def test_scrape_article_text_uses_cache_and_bloom_filter(self, mock_session_get):
+        """Test that a URL is downloaded once, then served from the cache once the Bloom filter has seen it."""
+        print("\n--- UNIT TEST: Testing scrape_article_text (Cache + Bloom Filter) ---")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = [mock_scraper_success_html().encode('utf-8')]
+        mock_response.headers = {}
+        mock_response.__enter__.return_value = mock_response
+        mock_session_get.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                override_settings(SCRAPER_BLOOM_PATH=os.path.join(tmp_dir, 'test.bloom')):
+            scraper._seen_urls_path = None
+            try:
+                print("LOG: Scraping the same URL twice...")
+                first = scraper.scrape_article_text("http://example.com/cached")
+                second = scraper.scrape_article_text("http://example.com/cached")
+
+                self.assertEqual(first, second)
+                self.assertIn("http://example.com/cached", scraper._get_seen_urls())
+                mock_session_get.assert_called_once()
+                print("LOG: Second call was served from the cache without a download.")
+            finally:
+                scraper._seen_urls = scraper._seen_urls_path = None
+
+    def test_bloom_filter_creation_and_rotation(self):
+        """Test that the filter file is created once, works with Redis, and is rotated."""
+        print("\n--- UNIT TEST: Testing the URL Bloom filter (Creation + Rotation) ---")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'test.bloom')
+
+            print("LOG: Opening the filter twice, as two workers starting together would...")
+            first = scraper._open_bloom_filter(path)
+            second = scraper._open_bloom_filter(path)
+            first.add("http://example.com/shared")
+            self.assertIn("http://example.com/shared", second)
+            self.assertEqual(os.listdir(tmp_dir), ['test.bloom'])
+            os.unlink(path)
+            print("LOG: Both handles share one file and no temporary files are left.")
+
+            print("LOG: Using a Redis cache across a rotation...")
+            redis_caches = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+            week = scraper.BLOOM_ROTATION_SECONDS
+            try:
+                with override_settings(SCRAPER_BLOOM_PATH=path, CACHES=redis_caches):
+                    with patch('api.scraper.time.time', return_value=10 * week):
+                        scraper._get_seen_urls().add("http://example.com/old")
+                        self.assertEqual(os.listdir(tmp_dir), ['test.10.bloom'])
+                    with patch('api.scraper.time.time', return_value=11 * week):
+                        self.assertNotIn("http://example.com/old", scraper._get_seen_urls())
+                        self.assertEqual(os.listdir(tmp_dir), ['test.11.bloom'])
+            finally:
+                scraper._seen_urls = scraper._seen_urls_path = None
+            print("LOG: The filter is used with Redis and the old file is replaced by a new one.")
+
+    @patch('api.scraper._session.get')
+    def test_scrape_article_text_revalidates_stale_entry(self, mock_session_get):
+        """Test that a stale cached page is revalidated with its ETag and reused on a 304."""
+        print("\n--- UNIT TEST: Testing scrape_article_text (Conditional GET) ---")
+        url = "http://example.com/unchanged"
+        stale_entry = scraper._make_entry("Previously scraped text.", '"abc123"', None)
+        stale_entry['fetched_at'] -= scraper.SCRAPE_CACHE_TIMEOUT + 1
+        cache.set(scraper.make_cache_key('scrape', url), stale_entry)
+
+        mock_response = MagicMock()
+        mock_response.status_code = 304
+        mock_response.__enter__.return_value = mock_response
+        mock_session_get.return_value = mock_response
+
+        with override_settings(SCRAPER_BLOOM_PATH=''):
+            print("LOG: Scraping a URL whose cached entry is stale...")
+            content = scraper.scrape_article_text(url)
+
+        self.assertEqual(content, "Previously scraped text.")
+        self.assertEqual(mock_session_get.call_args.kwargs['headers'], {'If-None-Match': '"abc123"'})
+        mock_response.iter_content.assert_not_called()
+        print("LOG: Sent If-None-Match and reused the cached text on 304.")
+
+    @patch('api.scraper._session.get')
+    def test_scrape_article_text_http_error(self, mock_session_get):
         """Test that the scraper handles HTTP errors (like 404) correctly."""
         print("\n--- UNIT TEST: Testing scrape_article_text (HTTP Error) ---")
         mock_response = MagicMock()
         mock_response.status_code = 404
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError
-        mock_requests_get.return_value = mock_response
+        mock_response.__enter__.return_value = mock_response
+        mock_session_get.return_value = mock_response
 
         print("LOG: Calling scrape_article_text expecting an error...")
         content = scraper.scrape_article_text("http://example.com/not-found")
         self.assertIsNone(content)
         print("LOG: Correctly handled HTTP error by returning None.")
 
+        print("LOG: Scraping the failed URL again...")
+        self.assertIsNone(scraper.scrape_article_text("http://example.com/not-found"))
+        mock_session_get.assert_called_once()
+        print("LOG: The recent failure was remembered and the URL was not requested again.")
+
+    @patch('api.scraper._session.get')
+    def test_scrape_article_text_keeps_text_when_revalidation_fails(self, mock_session_get):
+        """Test that a failed revalidation of a stale entry keeps its text and validators."""
+        print("\n--- UNIT TEST: Testing scrape_article_text (Failed Revalidation) ---")
+        url = "http://example.com/flaky"
+        key = scraper.make_cache_key('scrape', url)
+        stale_entry = scraper._make_entry("Previously scraped text.", '"abc123"', None)
+        stale_entry['fetched_at'] -= scraper.SCRAPE_CACHE_TIMEOUT + 1
+        cache.set(key, stale_entry)
+        mock_session_get.side_effect = requests.exceptions.ConnectionError("Site is down")
+
+        print("LOG: Revalidating while the site is down, then scraping again...")
+        self.assertEqual(scraper.scrape_article_text(url), "Previously scraped text.")
+        self.assertEqual(scraper.scrape_article_text(url), "Previously scraped text.")
+
+        mock_session_get.assert_called_once()
+        self.assertEqual(cache.get(key)['etag'], '"abc123"')
+        print("LOG: The last good text and its ETag were kept, and the retry was deferred.")
+
+    def test_parse_uses_site_selector_for_known_domains(self):
+        """Test that a known news site's own selector is used instead of the generic heuristics."""
+        print("\n--- UNIT TEST: Testing _parse (Site Selector) ---")
+        paragraph = "Paragraph of the actual story with plenty of words in it. " * 3
+        html = (
+            "<html><body><article>"
+            "<div data-component='headline-block'><h1>Headline</h1></div>"
+            "<div data-component='links-block'><ul><li>Related link one</li><li>Related link two</li></ul></div>"
+            f"<div data-component='text-block'><p>{paragraph}</p></div>"
+            f"<div data-component='text-block'><p>{paragraph}</p></div>"
+            "</article></body></html>"
+        ).encode()
+
+        print("LOG: Parsing a BBC-style page from www.bbc.co.uk...")
+        text = scraper._parse(html, "https://www.bbc.co.uk/news/articles/example")
+
+        self.assertEqual(text, f"{paragraph.strip()} {paragraph.strip()}")
+        self.assertNotIn("Related link", text)
+        print("LOG: Only the story paragraphs were extracted.")
+
+    def test_read_capped_truncates_large_pages(self):
+        """Test that downloads are cut off at MAX_CONTENT_BYTES."""
+        print("\n--- UNIT TEST: Testing _read_capped (Size Cap) ---")
+        chunk = b"x" * scraper.CHUNK_SIZE
+        chunk_count = scraper.MAX_CONTENT_BYTES // scraper.CHUNK_SIZE + 10
+        consumed = []
+
+        def chunks():
+            for _ in range(chunk_count):
+                consumed.append(1)
+                yield chunk
+
+        content = scraper._read_capped(chunks(), "http://example.com/huge")
+
+        self.assertEqual(len(content), scraper.MAX_CONTENT_BYTES)
+        self.assertLess(len(consumed), chunk_count)
+        print("LOG: Body was capped and the rest of the stream was not read.")
+
+    @patch('api.scraper._fetch_and_parse')
+    def test_scrape_article_texts_preserves_order(self, mock_fetch_and_parse):
+        """Test that concurrent scraping returns results in the same order as the input URLs."""
+        print("\n--- UNIT TEST: Testing scrape_article_texts (Order) ---")
+
+        async def fake_fetch_and_parse(session, url, previous=None):
+            if url.endswith('boom'):
+                raise RuntimeError("Unexpected failure")
+            return None if url.endswith('bad') else scraper._make_entry(f"Text for {url}", None, None)
+
+        mock_fetch_and_parse.side_effect = fake_fetch_and_parse
+
+        print("LOG: Calling scrape_article_texts with four URLs, one of which raises...")
+        results = scraper.scrape_article_texts(
+            ["http://a.com/1", "http://b.com/bad", "http://c.com/3", "http://d.com/boom"]
+        )
+
+        self.assertEqual(results, ["Text for http://a.com/1", None, "Text for http://c.com/3", None])
+        print("LOG: Results came back aligned with the input URLs.")
+
+    @patch('api.scraper.SCRAPE_BATCH_TIMEOUT', 0.1)
+    @patch('api.scraper._fetch_and_parse')
+    def test_scrape_article_texts_gives_up_on_stuck_batch(self, mock_fetch_and_parse):
+        """Test that a batch that never finishes is abandoned instead of blocking the caller."""
+        print("\n--- UNIT TEST: Testing scrape_article_texts (Stuck Batch) ---")
+
+        async def stuck_fetch_and_parse(session, url, previous=None):
+            await asyncio.sleep(5)
+
+        mock_fetch_and_parse.side_effect = stuck_fetch_and_parse
+
+        print("LOG: Scraping a URL whose download never finishes...")
+        started = time.monotonic()
+        results = scraper.scrape_article_texts(["http://example.com/stuck"])
+
+        self.assertEqual(results, [None])
+        self.assertLess(time.monotonic() - started, 2)
+        print("LOG: The batch was cancelled after its time bound.")
+
+    @patch('api.scraper._fetch_and_parse')
+    def test_scrape_article_texts_reuses_session(self, mock_fetch_and_parse):
+        """Test that separate batches share one HTTP session, so connections are reused."""
+        print("\n--- UNIT TEST: Testing scrape_article_texts (Session Reuse) ---")
+        sessions = []
+
+        async def fake_fetch_and_parse(session, url, previous=None):
+            sessions.append(session)
+            return scraper._make_entry(f"Text for {url}", None, None)
+
+        mock_fetch_and_parse.side_effect = fake_fetch_and_parse
+
+        print("LOG: Scraping two batches one after the other...")
+        scraper.scrape_article_texts(["http://a.com/session-1"])
+        scraper.scrape_article_texts(["http://b.com/session-2"])
+
+        self.assertEqual(len(sessions), 2)
+        self.assertIs(sessions[0], sessions[1])
+        self.assertFalse(sessions[0].closed)
+        print("LOG: Both batches used the same open session.")
+
 
 # --- INTEGRATION TESTS ---
 
-@patch('api.views.services.summarize_text', return_value="A perfect mock summary.")
-@patch('api.views.scrape_article_text', return_value="Mocked scraped content.")
+@override_settings(SCRAPER_BLOOM_PATH='')
+@patch('api.views.services.summarize_texts', return_value=["A perfect mock summary."])
+@patch('api.tasks.scrape_article_texts', return_value=["Mocked scraped content."])
 class APIIntegrationTests(TestCase):
     """
     Integration tests for the API endpoints.
@@ -134,6 +620,7 @@ class APIIntegrationTests(TestCase):
     def setUp(self):
         """Set up a test user and an authenticated client."""
         print("\n--- INTEGRATION TEST SETUP: Creating base user and client ---")
+        cache.clear()
         self.client = APIClient()
         self.test_user = User.objects.create_user(
             username='testuser', 
@@ -184,10 +671,13 @@ class APIIntegrationTests(TestCase):
         print("LOG: Received successful response with 1 article.")
         self.assertEqual(response.data[0]['summary'], "A perfect mock summary.")  # type: ignore
         print("LOG: Verified that the summary is the mocked summary.")
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()[0]['summary'], "A perfect mock summary.")
+        print("LOG: Verified that the rendered body is valid JSON.")
         
         mock_fetch.assert_called_once_with()
-        mock_scrape.assert_called_once_with('http://example.com/test-article')
-        mock_summarize.assert_called_once_with("Mocked scraped content.")
+        mock_scrape.assert_called_once_with(['http://example.com/test-article'])
+        mock_summarize.assert_called_once_with(["Mocked scraped content."])
 
     @patch('api.views.services.fetch_from_news_api')
     def test_search_news_endpoint(self, mock_fetch, mock_scrape, mock_summarize):
@@ -203,6 +693,51 @@ class APIIntegrationTests(TestCase):
         
         mock_fetch.assert_called_once_with(search_term='testing')
 
+    @patch('api.views.services.fetch_from_news_api')
+    def test_latest_news_falls_back_when_summarization_fails(self, mock_fetch, mock_scrape, mock_summarize):
+        """Test that a failed eager summarization task falls back to descriptions and can be retried."""
+        print("\n--- INTEGRATION TEST: Testing failed summarization on /api/latest/ ---")
+        mock_fetch.return_value = mock_news_api_success_data()
+        mock_summarize.side_effect = RuntimeError("Model failed to load")
+
+        print("LOG: Calling /api/latest/ twice while the model can't be loaded...")
+        for _ in range(2):
+            response = self.client.get('/api/latest/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data[0]['summary'], "This is a short test description.")  # type: ignore
+        self.assertEqual(mock_summarize.call_count, 2)
+        self.assertIsNone(cache.get(make_cache_key('summ-pending', 'http://example.com/test-article')))
+        print("LOG: Both responses used the description and the task was retried.")
+
+    @patch('api.views.scrape_and_summarize_task.delay')
+    @patch('api.views.services.fetch_from_news_api')
+    def test_latest_news_returns_pending_summaries(self, mock_fetch, mock_delay, mock_scrape, mock_summarize):
+        """Test that summaries not ready yet are returned as None and dispatched only once."""
+        print("\n--- INTEGRATION TEST: Testing pending summaries on /api/latest/ ---")
+        mock_fetch.return_value = mock_news_api_success_data()
+
+        print("LOG: Calling /api/latest/ twice while the worker is busy...")
+        response = self.client.get('/api/latest/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data[0]['summary'])  # type: ignore
+        self.client.get('/api/latest/')
+        mock_delay.assert_called_once_with([['http://example.com/test-article', 'This is the full test content.']])
+        print("LOG: Summary is pending and the task was dispatched once.")
+
+        print("LOG: Polling /api/summary/ before and after the worker finishes...")
+        response = self.client.get('/api/summary/', {'url': 'http://example.com/test-article'})
+        self.assertEqual(response.status_code, 202)
+        cache.set(make_cache_key('summ', 'http://example.com/test-article'), "Worker summary.")
+        response = self.client.get('/api/summary/', {'url': 'http://example.com/test-article'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['summary'], "Worker summary.")  # type: ignore
+        print("LOG: Summary endpoint reports pending, then the finished summary.")
+
+        print("LOG: Polling /api/summary/ for a URL that was never dispatched...")
+        response = self.client.get('/api/summary/', {'url': 'http://never.example/'})
+        self.assertEqual(response.status_code, 404)
+        print("LOG: Unknown URLs return 404 instead of pending.")
+
     def test_save_and_list_news_endpoints(self, mock_scrape, mock_summarize):
         """Test saving and listing articles, ensuring external services are not called."""
         print("\n--- INTEGRATION TEST: Testing /api/save/ and /api/saved/ endpoints ---")
@@ -232,3 +767,156 @@ class APIIntegrationTests(TestCase):
         mock_scrape.assert_not_called()
         mock_summarize.assert_not_called()
         print("LOG: Verified that external services (scrape, summarize) were not called.")
+
+    def test_save_news_generates_missing_summary(self, mock_scrape, mock_summarize):
+        """Test that saving an article without a summary stores one made by the summarization task."""
+        print("\n--- INTEGRATION TEST: Testing /api/save/ without a summary ---")
+        article_data = {
+            "title": "An Article Without Summary",
+            "url": "http://example.com/no-summary",
+            "source_name": "Save Source",
+            "summary": None,
+            "published_at": "2025-07-14T13:00:00Z"
+        }
+
+        print("LOG: Saving an article whose summary was still pending...")
+        save_response = self.client.post('/api/save/', article_data, format='json')
+        self.assertEqual(save_response.status_code, 201)
+        self.assertEqual(save_response.data['summary'], "A perfect mock summary.")  # type: ignore
+        self.assertEqual(Article.objects.get(url=article_data['url']).summary, "A perfect mock summary.")
+        mock_scrape.assert_called_once_with(["http://example.com/no-summary"])
+        mock_summarize.assert_called_once_with(["Mocked scraped content."])
+        print("LOG: The summary was generated once and stored with the article.")
+
+        print("LOG: Saving an article whose cached background summary failed...")
+        article_data.update(url="http://example.com/failed-before", title="Failed Before")
+        cache.set(make_cache_key('summ', article_data['url']), "")
+        save_response = self.client.post('/api/save/', article_data, format='json')
+        self.assertEqual(Article.objects.get(url=article_data['url']).summary, "A perfect mock summary.")
+        print("LOG: A cached empty summary counts as missing and is generated again.")
+
+        print("LOG: Saving another article whose summary fails...")
+        mock_summarize.return_value = [""]
+        article_data.update(url="http://example.com/no-summary-2", title="Another Article")
+        save_response = self.client.post('/api/save/', article_data, format='json')
+        self.assertEqual(save_response.status_code, 201)
+        self.assertEqual(Article.objects.get(url=article_data['url']).summary, "")
+        print("LOG: A failed summary is left empty to be filled in later, not replaced by a placeholder.")
+
+    @patch('api.views.summarize_saved_article_task.delay')
+    def test_save_news_does_not_wait_for_worker(self, mock_delay, mock_scrape, mock_summarize):
+        """Test that with a broker the article is saved at once and summarized on the worker."""
+        print("\n--- INTEGRATION TEST: Testing /api/save/ with a busy worker ---")
+        article_data = {
+            "title": "Saved While Busy",
+            "url": "http://example.com/busy",
+            "source_name": "Save Source",
+            "summary": "",
+            "published_at": "2025-07-14T13:00:00Z"
+        }
+        save_response = self.client.post('/api/save/', article_data, format='json')
+        self.assertEqual(save_response.status_code, 201)
+        article = Article.objects.get(url=article_data['url'])
+        self.assertEqual(article.summary, "")
+        mock_delay.assert_called_once_with(article.id)
+        mock_scrape.assert_not_called()
+        print("LOG: The save returned immediately and the summary task was queued.")
+
+    def test_bulk_save_news_endpoint(self, mock_scrape, mock_summarize):
+        """Test saving several articles at once, with duplicates skipped."""
+        print("\n--- INTEGRATION TEST: Testing /api/save/bulk/ endpoint ---")
+        articles = [
+            {
+                "title": f"Bulk Article {i}",
+                "url": f"http://example.com/bulk-{i}",
+                "source_name": "Bulk Source",
+                "summary": f"Summary {i}.",
+                "published_at": "2025-07-14T13:00:00Z"
+            }
+            for i in range(3)
+        ]
+
+        print("LOG: Step 1 - Saving three articles via POST to /api/save/bulk/...")
+        response = self.client.post('/api/save/bulk/', articles, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Article.objects.filter(user=self.test_user).count(), 3)
+        self.assertEqual(len(response.data['created']), 3)  # type: ignore
+        self.assertTrue(all(article['id'] for article in response.data['created']))  # type: ignore
+        self.assertEqual(response.data['skipped'], [])  # type: ignore
+        print("LOG: All three articles saved and returned with their ids.")
+
+        print("\nLOG: Step 2 - Saving the same articles again...")
+        response = self.client.post('/api/save/bulk/', articles, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Article.objects.filter(user=self.test_user).count(), 3)
+        self.assertEqual(response.data['created'], [])  # type: ignore
+        self.assertEqual([s['reason'] for s in response.data['skipped']], ['already_saved'] * 3)  # type: ignore
+        print("LOG: Duplicates were skipped and reported.")
+
+        print("\nLOG: Step 3 - Another user saving one of the same URLs and a new one...")
+        other_user = User.objects.create_user(username='otheruser', password='otherpassword123')
+        self.client.force_authenticate(user=other_user)
+        new_article = dict(articles[0], url="http://example.com/bulk-new")
+        response = self.client.post('/api/save/bulk/', [articles[0], new_article], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([a['url'] for a in response.data['created']], ["http://example.com/bulk-new"])  # type: ignore
+        self.assertEqual(
+            response.data['skipped'],  # type: ignore
+            [{'url': "http://example.com/bulk-0", 'reason': 'saved_by_another_user'}],
+        )
+        print("LOG: The URL saved by another user was reported, not silently dropped.")
+
+    def test_saved_news_pagination(self, mock_scrape, mock_summarize):
+        """Test that /api/saved/ paginates only when a page size is requested."""
+        print("\n--- INTEGRATION TEST: Testing /api/saved/ pagination ---")
+        for i in range(3):
+            Article.objects.create(
+                user=self.test_user,
+                title=f"Saved Article {i}",
+                url=f"http://example.com/saved-{i}",
+                source_name="Saved Source",
+                summary=f"Summary {i}.",
+                published_at="2025-07-14T13:00:00Z",
+            )
+
+        print("LOG: Requesting the full list without a page size...")
+        response = self.client.get('/api/saved/')
+        self.assertEqual(len(response.data), 3)  # type: ignore
+
+        print("LOG: Requesting the first page of two articles...")
+        response = self.client.get('/api/saved/?page_size=2')
+        self.assertEqual(response.data['count'], 3)  # type: ignore
+        self.assertEqual(len(response.data['results']), 2)  # type: ignore
+        self.assertIsNotNone(response.data['next'])  # type: ignore
+        print("LOG: Pagination is applied only when requested.")
+
+    @patch('api.views.services.fetch_from_news_api')
+    def test_conditional_get_returns_not_modified(self, mock_fetch, mock_scrape, mock_summarize):
+        """Test that unchanged news and saved lists are answered with 304 Not Modified."""
+        print("\n--- INTEGRATION TEST: Testing ETag / If-None-Match ---")
+        mock_fetch.return_value = mock_news_api_success_data()
+
+        print("LOG: Requesting /api/latest/ twice with the returned ETag...")
+        response = self.client.get('/api/latest/')
+        etag = response['ETag']
+        response = self.client.get('/api/latest/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        print("LOG: Requesting /api/saved/ before and after saving an article...")
+        response = self.client.get('/api/saved/')
+        etag = response['ETag']
+        response = self.client.get('/api/saved/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Article.objects.create(
+            user=self.test_user,
+            title="New Article",
+            url="http://example.com/new",
+            source_name="Saved Source",
+            summary="Summary.",
+            published_at="2025-07-14T13:00:00Z",
+        )
+        response = self.client.get('/api/saved/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)  # type: ignore
+        print("LOG: Unchanged lists return 304; a changed list returns the new data.")
@@ -5,7 +5,9 @@ from .views import (
     UserRegistrationView, 
     LatestNewsView, 
     SearchNewsView, 
+    SummaryView,
     SaveNewsView, 
+    SaveNewsBulkView,
     SavedNewsView
 )
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
@@ -19,7 +21,9 @@ urlpatterns = [
     # Add the new paths for the news API
     path('latest/', LatestNewsView.as_view(), name='latest-news'),
     path('search/', SearchNewsView.as_view(), name='search-news'),
+    path('summary/', SummaryView.as_view(), name='article-summary'),
     path('save/', SaveNewsView.as_view(), name='save-news'),
+    path('save/bulk/', SaveNewsBulkView.as_view(), name='save-news-bulk'),
     path('saved/', SavedNewsView.as_view(), name='saved-news'),
 ]
 
@@ -4,18 +4,126 @@ from .serializers import UserRegistrationSerializer
 from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.permissions import IsAuthenticated
 from . import services
 from .models import Article
-from .serializers import ArticleSerializer
-from django.db.models import QuerySet
-from .scraper import scrape_article_text # Import the scraper
+from .serializers import ArticleSerializer, ArticleBulkSerializer
+from django.db.models import Count, Max, QuerySet
+from django.utils.http import parse_etags, quote_etag
+from .tasks import scrape_and_summarize_task, summarize_saved_article_task
+from .caching import make_cache_key
+from .renderers import ORJSONRenderer
+from django.conf import settings
+from django.core.cache import cache
+import hashlib
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
 # Create your views here.
 
+def _get_summaries(entries):
+    """
+    Returns the cached summary for each article and dispatches one background
+    scrape-and-summarize task for the articles that don't have one yet.
+    Articles whose summary is still being generated get None.
+    """
+    urls = [a.get('url') or "" for a in entries]
+    keys = [make_cache_key('summ', url) for url in urls]
+    summaries = cache.get_many(keys)
+
+    missing = [(url, key, a) for url, key, a in zip(urls, keys, entries) if key not in summaries]
+    # cache.add is atomic, so only the first request for an article dispatches its task.
+    to_dispatch = [
+        (url, a) for url, key, a in missing
+        if cache.add(make_cache_key('summ-pending', url), True, settings.SUMMARY_TASK_TIMEOUT)
+    ]
+    failed = {}
+    if to_dispatch:
+        items = [[url, a.get('content') or a.get('description') or ""] for url, a in to_dispatch]
+        try:
+            # Without a broker this runs the task eagerly and re-raises its errors
+            # (CELERY_TASK_EAGER_PROPAGATES), so a failure is handled here either way.
+            scrape_and_summarize_task.delay(items)
+        except Exception as e:
+            logger.error(f"Summarization task failed or could not be dispatched: {e}")
+            cache.delete_many([make_cache_key('summ-pending', url) for url, _ in to_dispatch])
+            # These summaries will never arrive, so let the caller fall back to the description.
+            failed = {make_cache_key('summ', url): "" for url, _ in to_dispatch}
+
+    if missing:
+        # Without a broker the task runs eagerly, so its summaries are already cached.
+        summaries.update(cache.get_many([key for _, key, _ in missing]))
+        summaries.update(failed)
+    return [summaries.get(key) for key in keys]
+
+def _build_article_list(news_data):
+    """
+    Turns a NewsAPI response into the list of article dicts returned by the news views,
+    with each summary taken from _get_summaries or falling back to the description.
+    """
+    # Ensure article_data is a dictionary before processing
+    entries = [a for a in news_data.get('articles', []) if isinstance(a, dict)]
+
+    # Scraping and summarization run on a Celery worker; summaries that are
+    # not ready yet are returned as None and can be fetched from /api/summary/.
+    summaries = _get_summaries(entries)
+
+    articles = []
+    pending = fallbacks = 0
+    for article_data, summary in zip(entries, summaries):
+        if summary is None:
+            pending += 1
+        elif not summary.strip():
+            # Final fallback: if summary is still empty, use the original description.
+            summary = article_data.get('description') or "No summary available."
+            fallbacks += 1
+
+        articles.append({
+            'title': article_data.get('title'),
+            'url': article_data.get('url'),
+            'source_name': (article_data.get('source') or {}).get('name'),
+            'summary': summary,
+            'published_at': article_data.get('publishedAt'),
+        })
+
+    # One log line per response; logging every article went to the console and the log file each time.
+    logger.info(
+        f"Built {len(articles)} articles: {len(articles) - pending - fallbacks} summarized, "
+        f"{pending} pending, {fallbacks} using the API description."
+    )
+    return articles
+
+def _etag_for(value):
+    """
+    Builds a quoted ETag from a string or bytes value.
+    """
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return quote_etag(hashlib.blake2b(value, digest_size=16).hexdigest())
+
+def _not_modified(request, etag):
+    """
+    Returns True if the client's If-None-Match header already holds this ETag.
+    """
+    etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    return '*' in etags or any(tag.removeprefix('W/') == etag for tag in etags)
+
+def _conditional_response(request, data, etag=None):
+    """
+    Returns data with an ETag, or an empty 304 response if the client already has it.
+    Responses are per user, so shared caches must not store them.
+    """
+    if etag is None:
+        etag = _etag_for(orjson.dumps(data))
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if _not_modified(request, etag):
+        return Response(status=304, headers=headers)
+    return Response(data, headers=headers)
+
 class UserRegistrationView(generics.CreateAPIView):
     """
     An endpoint for registering a new user.
@@ -30,54 +138,14 @@ class LatestNewsView(APIView):
     This endpoint does not interact with the database.
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
 
     def get(self, request):
         news_data = services.fetch_from_news_api()
         if 'error' in news_data:
             return Response(news_data, status=500)
 
-        articles = []
-        for article_data in news_data.get('articles', []):
-            # Ensure article_data is a dictionary before processing
-            if not isinstance(article_data, dict):
-                continue
-            
-            # --- Scraper Integration ---
-            text_to_summarize = None
-            scraped_content = scrape_article_text(article_data.get('url'))
-            
-            if scraped_content:
-                text_to_summarize = scraped_content
-            else:
-                text_to_summarize = article_data.get('content') or article_data.get('description')
-
-            # --- End Scraper Integration ---
-
-            # --- New Summarization Logic ---
-            summary = ""
-            original_description = article_data.get('description') or ""
-
-            if text_to_summarize and text_to_summarize.strip():
-                # Only run the summarizer if we have actual text
-                summary = services.summarize_text(text_to_summarize)
-                logger.info(f"SUCCESS (Summarizer): Summarized {article_data.get('url')}")
-            else:
-                logger.warning(f"No content found for summarization for {article_data.get('url')}.")
-
-            # Final fallback: if summary is still empty, use the original description.
-            if not summary.strip():
-                summary = original_description or "No summary available."
-                logger.info(f"FALLBACK (Final): Using API description for {article_data.get('url')}")
-            # --- End New Summarization Logic ---
-
-            articles.append({
-                'title': article_data.get('title'),
-                'url': article_data.get('url'),
-                'source_name': article_data.get('source', {}).get('name'),
-                'summary': summary,
-                'published_at': article_data.get('publishedAt'),
-            })
-        return Response(articles)
+        return _conditional_response(request, _build_article_list(news_data))
 
 
 class SearchNewsView(APIView):
@@ -86,6 +154,7 @@ class SearchNewsView(APIView):
     This endpoint does not interact with the database.
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
 
     def get(self, request):
         query = request.query_params.get('q', None)
@@ -96,47 +165,30 @@ class SearchNewsView(APIView):
         if 'error' in news_data:
             return Response(news_data, status=500)
 
-        articles = []
-        for article_data in news_data.get('articles', []):
-            # Ensure article_data is a dictionary before processing
-            if not isinstance(article_data, dict):
-                continue
-
-            # --- Scraper Integration ---
-            text_to_summarize = None
-            scraped_content = scrape_article_text(article_data.get('url'))
-
-            if scraped_content:
-                text_to_summarize = scraped_content
-            else:
-                text_to_summarize = article_data.get('content') or article_data.get('description')
-            # --- End Scraper Integration ---
-
-            # --- New Summarization Logic ---
-            summary = ""
-            original_description = article_data.get('description') or ""
-
-            if text_to_summarize and text_to_summarize.strip():
-                # Only run the summarizer if we have actual text
-                summary = services.summarize_text(text_to_summarize)
-                logger.info(f"SUCCESS (Summarizer): Summarized {article_data.get('url')}")
-            else:
-                logger.warning(f"No content found for summarization for {article_data.get('url')}.")
+        return _conditional_response(request, _build_article_list(news_data))
 
-            # Final fallback: if summary is still empty, use the original description.
-            if not summary.strip():
-                summary = original_description or "No summary available."
-                logger.info(f"FALLBACK (Final): Using API description for {article_data.get('url')}")
-            # --- End New Summarization Logic ---
 
-            articles.append({
-                'title': article_data.get('title'),
-                'url': article_data.get('url'),
-                'source_name': article_data.get('source', {}).get('name'),
-                'summary': summary,
-                'published_at': article_data.get('publishedAt'),
-            })
-        return Response(articles)
+class SummaryView(APIView):
+    """
+    Returns the generated summary for a single article URL (?url=...).
+    Used to poll for summaries that were still pending in a news response.
+    Returns 404 for URLs that have no summary and are not being summarized.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+
+    def get(self, request):
+        url = request.query_params.get('url', None)
+        if not url:
+            return Response({'error': 'Query parameter "url" is required.'}, status=400)
+
+        summary = cache.get(make_cache_key('summ', url))
+        if summary is not None:
+            return Response({'url': url, 'status': 'ready', 'summary': summary})
+        if cache.get(make_cache_key('summ-pending', url)) is not None:
+            return Response({'url': url, 'status': 'pending', 'summary': None}, status=202)
+        # Never dispatched (or the task failed), so polling would never end.
+        return Response({'url': url, 'status': 'not_found', 'summary': None}, status=404)
 
 
 class SaveNewsView(generics.CreateAPIView):
@@ -147,19 +199,88 @@ class SaveNewsView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
+        # Store a summary with the article once, so listing saved articles never runs the model.
+        summary = serializer.validated_data.get('summary') or ""
         # Automatically associate the article with the logged-in user.
-        serializer.save(user=self.request.user)
+        article = serializer.save(user=self.request.user, summary=summary)
+        if summary.strip():
+            return
+        # A missing, null or blank summary (one that was still pending) is filled in by the
+        # summarization task, so the request never waits behind a news batch on the worker.
+        try:
+            summarize_saved_article_task.delay(article.id)
+        except Exception as e:
+            logger.error(f"Could not summarize saved article {article.url}: {e}")
+        # Without a broker the task ran eagerly, so the summary may already be stored.
+        article.refresh_from_db(fields=['summary'])
+
+
+class SaveNewsBulkView(generics.CreateAPIView):
+    """
+    Saves a list of news articles to the logged-in user's account in one request.
+    Articles whose URL is already saved (by this user or another) are skipped and reported.
+    """
+    serializer_class = ArticleBulkSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_serializer(self, *args, **kwargs):
+        # The request body is a list of articles.
+        kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Automatically associate every article with the logged-in user.
+        created = serializer.save(user=request.user)
+        # Report what was actually inserted, and which articles were skipped and why.
+        return Response(
+            {'created': ArticleSerializer(created, many=True).data, 'skipped': serializer.skipped},
+            status=201,
+        )
+
+
+class SavedNewsPagination(PageNumberPagination):
+    """
+    Opt-in pagination for saved articles. Without a ?page_size= parameter the full
+    list is returned as before; with it, only one page of rows is loaded.
+    """
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 100
 
 
 class SavedNewsView(generics.ListAPIView):
     """
     Lists all news articles saved by the logged-in user.
+    Pass ?page_size=N (and ?page=M) to get the list one page at a time.
     """
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = SavedNewsPagination
 
     def get_queryset(self) -> QuerySet[Article]:
         """
         Filter articles to only show those belonging to the current user.
         """
-        return Article.objects.filter(user=self.request.user).order_by('-saved_at')
+        # Only load the columns the serializer actually returns.
+        return (
+            Article.objects.filter(user_id=self.request.user.id)
+            .only(*ArticleSerializer.Meta.fields)
+            .order_by('-saved_at')
+        )
+
+    def list(self, request, *args, **kwargs):
+        # The list only changes when articles are added or removed, so the ETag comes from one
+        # aggregate query and an unchanged list is answered without loading or serializing rows.
+        stats = Article.objects.filter(user_id=request.user.id).aggregate(
+            count=Count('id'), latest=Max('saved_at')
+        )
+        etag = _etag_for(f"{stats['count']}:{stats['latest']}:{request.GET.urlencode()}")
+        if _not_modified(request, etag):
+            return Response(status=304, headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+        response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -0,0 +1,20 @@
+"""
+Celery configuration for news_summary_project project.
+
+Workers are started with:
+    celery -A news_summary_project worker --loglevel=info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_summary_project.settings')
+
+app = Celery('news_summary_project')
+
+# Read all CELERY_* settings from the Django settings module.
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Discover tasks.py modules in all installed apps.
+app.autodiscover_tasks()
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -143,6 +144,82 @@ REST_FRAMEWORK = {
     )
 }
 
+# --- Logging Configuration ---
+# Logs from the api app go to the console and to a rotating file. The file is
+# only opened on the first write (delay=True), so commands that never log
+# don't create it.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'standard': {
+            'format': '%(asctime)s %(levelname)s %(name)s: %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'standard',
+        },
+        'api_file': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'api.log',
+            'maxBytes': 5 * 1024 * 1024,
+            'backupCount': 3,
+            'delay': True,
+            'formatter': 'standard',
+        },
+    },
+    'loggers': {
+        'api': {
+            'handlers': ['console', 'api_file'],
+            'level': os.getenv('API_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# --- Cache Configuration ---
+# Scraped article text and summaries are cached by URL / content hash.
+# Use Redis when REDIS_URL is set so the cache is shared by all workers;
+# otherwise fall back to Django's per-process in-memory cache.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Memory-mapped Bloom filter of scraped URLs, used to skip cache lookups (a Redis round
+# trip with REDIS_URL) for URLs that have never been scraped. Disabled unless
+# SCRAPER_BLOOM_PATH is set, e.g. to BASE_DIR / 'articles.bloom'; the file is rotated weekly.
+SCRAPER_BLOOM_PATH = os.getenv('SCRAPER_BLOOM_PATH', '')
+
+# --- Celery Configuration ---
+# Scraping and summarization run on a Celery worker that keeps the model loaded;
+# the news views return immediately and summaries are filled in as tasks finish.
+# If no broker is configured, tasks run eagerly in the web process instead.
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
+# The worker hands summaries to the web process through the cache, so a worker
+# needs a cache both processes can see; the in-memory cache is per process.
+if CELERY_BROKER_URL and not REDIS_URL:
+    raise ImproperlyConfigured("CELERY_BROKER_URL requires REDIS_URL: the worker and the web process must share a cache.")
+CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+# Eager tasks re-raise their errors, so the view sees a failed summarization
+# instead of waiting for summaries that will never arrive.
+CELERY_TASK_EAGER_PROPAGATES = True
+# One model per worker process (one per GPU), and no task hoarding.
+CELERY_WORKER_CONCURRENCY = 1
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Each pool child loads the model before reporting that it is up. Celery's default of
+# 4 seconds is shorter than the load, so the child would be killed and restarted forever.
+CELERY_WORKER_PROC_ALIVE_TIMEOUT = float(os.getenv('CELERY_WORKER_PROC_ALIVE_TIMEOUT', '300'))
+# How long an article counts as being summarized before another request may re-dispatch it.
+SUMMARY_TASK_TIMEOUT = int(os.getenv('SUMMARY_TASK_TIMEOUT', '120'))
+
 # --- Simple JWT Configuration (Optional) ---
 # The following is an example of how to customize token lifetimes.
 # By default, access tokens last 5 minutes and refresh tokens last 24 hours.